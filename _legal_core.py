@@ -0,0 +1,106 @@
+"""Integer kernels for legal-move detection on bitboards.
+
+Every function here works purely on ints: bit `i` of a bitboard is set
+when position `i` (0..23) is occupied. When `numba` is installed the
+kernels are JIT-compiled to native code; otherwise they run as plain
+Python with identical results.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator used when numba is not available."""
+        def decorator(func):
+            return func
+        return decorator
+
+# Mask covering all 24 board positions
+FULL_MASK = 0xFFFFFF
+
+# Modulus mapping an isolated bit to its slot in an `as_bit_table` table
+BIT_KEY = 37
+
+# Phase codes taken by `has_any_move`; `GamePhase` uses them as its values
+PHASE_PLACING, PHASE_MOVING, PHASE_FLYING = 1, 2, 3
+
+
+def as_bit_table(values):
+    """Convert per-position masks into a table indexed by ``(1 << pos) % BIT_KEY``.
+
+    The residues of 2**0 .. 2**35 modulo 37 are all distinct, so a kernel
+    can look up the entry for an isolated bit ``low = bb & -bb`` as
+    ``table[low % BIT_KEY]`` without first computing its index. Returns an
+    int64 numpy array when numba is in use, otherwise a tuple.
+    """
+    table = [0] * BIT_KEY
+    for pos, value in enumerate(values):
+        table[(1 << pos) % BIT_KEY] = value
+    if np is not None:
+        return np.array(table, dtype=np.int64)
+    return tuple(table)
+
+
+@njit(cache=True)
+def legal_moves_place(bb_self, bb_opp):
+    """Return the mask of positions a piece can be placed on (every empty position)."""
+    return ~(bb_self | bb_opp) & FULL_MASK
+
+
+@njit(cache=True)
+def legal_moves_move(bb_self, bb_opp, adj, selected):
+    """Return the mask of legal MOVING-phase choices.
+
+    `adj` is the neighbour table built by `as_bit_table`.
+
+    With no piece selected (`selected` < 0) these are the player's pieces
+    that have an empty neighbour; otherwise the empty neighbours of
+    `selected`.
+    """
+    empty = ~(bb_self | bb_opp) & FULL_MASK
+    if selected >= 0:
+        return adj[(1 << selected) % BIT_KEY] & empty
+    movable = 0
+    bb = bb_self
+    while bb:
+        low = bb & -bb
+        if adj[low % BIT_KEY] & empty:
+            movable |= low
+        bb ^= low
+    return movable
+
+
+@njit(cache=True)
+def legal_moves_fly(bb_self, bb_opp, selected):
+    """Return the mask of legal FLYING-phase choices.
+
+    With no piece selected (`selected` < 0) any of the player's pieces may
+    be picked; otherwise any empty position is a target.
+    """
+    if selected >= 0:
+        return ~(bb_self | bb_opp) & FULL_MASK
+    return bb_self
+
+
+@njit(cache=True)
+def has_any_move(bb_self, bb_opp, adj, phase):
+    """Return True if the player owning `bb_self` has at least one legal move in `phase`.
+
+    Stops at the first piece found able to move, unlike building the full
+    mask with `legal_moves_move`. `adj` is the neighbour table built by
+    `as_bit_table`.
+    """
+    empty = ~(bb_self | bb_opp) & FULL_MASK
+    if phase == PHASE_PLACING or phase == PHASE_FLYING:
+        return empty != 0
+    if phase == PHASE_MOVING:
+        bb = bb_self
+        while bb:
+            low = bb & -bb
+            if adj[low % BIT_KEY] & empty:
+                return True
+            bb ^= low
+    return False
@@ -5,6 +5,10 @@ from yaspin import yaspin
 from yaspin.spinners import Spinners
 # from nine_mens_morris import Game, NineMensMorrisUI, Player, GamePhase
 from simple_ai_models import SimpleAI
+from _legal_core import (
+    BIT_KEY, FULL_MASK, PHASE_FLYING, PHASE_MOVING, PHASE_PLACING,
+    as_bit_table, has_any_move, legal_moves_fly, legal_moves_move, legal_moves_place,
+)
 
 
 class Player:
@@ -13,27 +17,50 @@ class Player:
     Attributes:
         name (str): Player display name.
         player_symbol (str): Single-character symbol placed on board (e.g. 'X' or 'O').
+        counts (int): Both piece counters packed into one int; read them
+            through `pieces_in_hand` / `pieces_on_board`.
         pieces_in_hand (int): Pieces remaining to place during the placing phase.
         pieces_on_board (int): Pieces currently on the board.
         player_type (str): Type of player, either "human" or "ai".
     """
 
+    __slots__ = ("name", "player_symbol", "counts", "player_type")
+
+    # Layout of `counts`: pieces_in_hand above HAND_SHIFT, pieces_on_board in BOARD_MASK
+    HAND_SHIFT = 8
+    BOARD_MASK = (1 << HAND_SHIFT) - 1
+
     def __init__(self, name, player_symbol, player_type="human"):
         self.name = name
         self.player_symbol = player_symbol
-        self.pieces_in_hand = 9
-        self.pieces_on_board = 0
+        self.counts = 9 << self.HAND_SHIFT  # 9 pieces in hand, none on board
         self.player_type = player_type  # or "ai"
 
+    @property
+    def pieces_in_hand(self):
+        return self.counts >> self.HAND_SHIFT
+
+    @pieces_in_hand.setter
+    def pieces_in_hand(self, value):
+        self.counts = (value << self.HAND_SHIFT) | (self.counts & self.BOARD_MASK)
+
+    @property
+    def pieces_on_board(self):
+        return self.counts & self.BOARD_MASK
+
+    @pieces_on_board.setter
+    def pieces_on_board(self, value):
+        self.counts = (self.counts & ~self.BOARD_MASK) | value
+
     def place_piece(self):
         """Move a piece from the player's hand onto the board state tracking.
 
         Returns True if a piece was placed (i.e. there was at least one in hand),
         otherwise False.
         """
-        if self.pieces_in_hand > 0:
-            self.pieces_in_hand -= 1
-            self.pieces_on_board += 1
+        if self.counts >> self.HAND_SHIFT:
+            # One less in hand, one more on board, in a single update
+            self.counts += 1 - (1 << self.HAND_SHIFT)
             return True
         return False
 
@@ -42,99 +69,135 @@ class Player:
 
         Returns True if a piece was removed, False if none available.
         """
-        if self.pieces_on_board > 0:
-            self.pieces_on_board -= 1
+        if self.counts & self.BOARD_MASK:
+            self.counts -= 1
             return True
         return False
 
 class BoardManager():
+
+    __slots__ = ("bb_x", "bb_o")
     
     def __init__(self):
-        self.board = self.make_new_board()
+        self.bb_x, self.bb_o = self.make_new_board()
 
     @staticmethod
     def make_new_board():
-        """Create a fresh empty board represented as a list of 24 positions.
+        """Create a fresh empty board represented as a pair of bitboards.
 
-        Each position holds a single-character symbol: '.' for empty, or
-        the player's symbol (e.g. 'X' / 'O'). The board indices 0..23 follow
-        a standard Nine Men's Morris layout mapping used across the module.
+        Bit `i` of `bb_x` (resp. `bb_o`) is set when position `i` holds an
+        'X' (resp. 'O') piece; a position is empty when neither bit is set.
+        The board indices 0..23 follow a standard Nine Men's Morris layout
+        mapping used across the module.
         """
-        return list("." * 24)
+        return 0, 0
+
+    def to_list(self):
+        """Return the board as a list of 24 symbols ('.', 'X' or 'O') for display."""
+        return [self.who_on_position(i) for i in range(24)]
+
+    @staticmethod
+    def bits_to_positions(bb):
+        """Return the indices of the set bits of `bb` in ascending order."""
+        positions = []
+        while bb:
+            positions.append((bb & -bb).bit_length() - 1)
+            bb &= bb - 1
+        return positions
+
+    def get_player_bitboard(self, player_symbol):
+        return self.bb_x if player_symbol == "X" else self.bb_o
+
+    def set_player_bitboard(self, player_symbol, bb):
+        if player_symbol == "X":
+            self.bb_x = bb
+        else:
+            self.bb_o = bb
+
+    def get_empty_bitboard(self):
+        return ~(self.bb_x | self.bb_o) & FULL_MASK
     
     def is_position_empty(self, position):
-        return self.board[position] == "."
+        return not ((self.bb_x | self.bb_o) >> position) & 1
     
     def who_on_position(self, position):
-        return self.board[position]
+        if (self.bb_x >> position) & 1:
+            return "X"
+        if (self.bb_o >> position) & 1:
+            return "O"
+        return "."
     
     def get_players_positions(self, player_symbol):
-        positions = []
-        for i in range(len(self.board)):
-            if self.who_on_position(i) == player_symbol:
-                positions.append(i)
-        return positions
-
-    # Precomputed adjacency list for each board position. Used to validate legal moves during the MOVING phase (only adjacent moves allowed).
-    adjacent_arrays = [[1, 9], [0, 2, 4], [1, 14],
-                            [10, 4], [1, 3, 7, 5], [4, 13],
-                            [7, 11], [4, 6, 8], [7, 12],
-                            [0, 10, 21], [3, 9, 18, 11], [6, 10, 15],
-                            [8, 13, 17], [5, 12, 20, 14], [2, 13, 23],
-                            [11, 16], [15, 17, 19], [12, 16],
-                            [10, 19], [16, 18, 22, 20], [13, 19],
-                            [9, 22], [19, 21, 23], [14, 22],]
+        return self.bits_to_positions(self.get_player_bitboard(player_symbol))
+
+    # Precomputed adjacency table (tuple of tuples) for each board position. Used to validate legal moves during the MOVING phase (only adjacent moves allowed).
+    adjacent_arrays = ((1, 9), (0, 2, 4), (1, 14),
+                            (10, 4), (1, 3, 7, 5), (4, 13),
+                            (7, 11), (4, 6, 8), (7, 12),
+                            (0, 10, 21), (3, 9, 18, 11), (6, 10, 15),
+                            (8, 13, 17), (5, 12, 20, 14), (2, 13, 23),
+                            (11, 16), (15, 17, 19), (12, 16),
+                            (10, 19), (16, 18, 22, 20), (13, 19),
+                            (9, 22), (19, 21, 23), (14, 22),)
+
+    # Bitmask of the neighbours of each position, in the `as_bit_table` form
+    # shared with the `_legal_core` kernels: look up position p as
+    # ADJ_TABLE[(1 << p) % BIT_KEY]
+    ADJ_TABLE = as_bit_table([sum(1 << n for n in adj) for adj in adjacent_arrays])
 
     def get_empty_positions(self):
-        empty_positions = []
-        for i in range(len(self.board)):
-            if self.is_position_empty(i):
-                empty_positions.append(i)
-        return empty_positions
+        return self.bits_to_positions(self.get_empty_bitboard())
     
     def get_empty_adjacent_positions(self, position):
-        empty_positions = []
-        for adj in self.adjacent_arrays[position]:
-            if self.is_position_empty(adj):
-                empty_positions.append(adj)
-        return empty_positions
+        # int() since the table holds numpy ints when numba is in use
+        return self.bits_to_positions(int(self.ADJ_TABLE[(1 << position) % BIT_KEY]) & self.get_empty_bitboard())
+
+    def has_empty_adjacent(self, position):
+        return bool(self.ADJ_TABLE[(1 << position) % BIT_KEY] & ~(self.bb_x | self.bb_o))
     
     def add_player_piece(self, position, player_symbol):
         if self.is_position_empty(position):
-            self.board[position] = player_symbol
+            self.set_player_bitboard(player_symbol, self.get_player_bitboard(player_symbol) | (1 << position))
             return True
         return False
     
     def remove_player_piece(self, position):
         if not self.is_position_empty(position):
-            self.board[position] = "."
+            clear = ~(1 << position)
+            self.bb_x &= clear
+            self.bb_o &= clear
             return True
         return False
     
     def move_player_piece(self, from_position, to_position, player_symbol):
         # Validate the move: correct owner, destination empty, and positions adjacent
+        bb = self.get_player_bitboard(player_symbol)
         if (
-            self.board[from_position] == player_symbol
+            (bb >> from_position) & 1
             and self.is_position_empty(to_position)
-            and to_position in self.adjacent_arrays[from_position]
+            and (self.ADJ_TABLE[(1 << from_position) % BIT_KEY] >> to_position) & 1
         ):
-            self.board[from_position] = "."
-            self.board[to_position] = player_symbol
+            self.set_player_bitboard(player_symbol, (bb & ~(1 << from_position)) | (1 << to_position))
             return True
         return False
     
     def fly_player_piece(self, from_position, to_position, player_symbol):
         # Flying allows jumping to any empty position (used when player has 3 pieces)
-        if (self.board[from_position] == player_symbol and self.is_position_empty(to_position)):
-            self.board[from_position] = "."
-            self.board[to_position] = player_symbol
+        bb = self.get_player_bitboard(player_symbol)
+        if ((bb >> from_position) & 1 and self.is_position_empty(to_position)):
+            self.set_player_bitboard(player_symbol, (bb & ~(1 << from_position)) | (1 << to_position))
             return True
         return False
 
+def mills_by_position(mill_masks):
+    """Return, for each of the 24 positions, a tuple of the mill masks containing it."""
+    return tuple(tuple(m for m in mill_masks if (m >> p) & 1) for p in range(24))
+
 class GamePhase(Enum):
-    PLACING = 1
-    MOVING = 2
-    FLYING = 3
+    # The first three values are the phase codes of the `_legal_core` kernels
+    PLACING = PHASE_PLACING
+    MOVING = PHASE_MOVING
+    FLYING = PHASE_FLYING
     REMOVING_PIECE = 4
     GAME_OVER = 5
 
@@ -146,27 +209,46 @@ class Game():
     itself — that logic is in `NineMensMorrisUI`.
     """
 
+    __slots__ = (
+        "player1", "player2", "players", "cur", "board_manager", "current_phase",
+        "selected_piece", "game_history", "legal_moves", "_legal_cache", "dirty",
+    )
+
     def __init__(self, player_1, player_2):
         self.player1 = player_1
         self.player2 = player_2
         self.board_manager = BoardManager()
-        self.current_player = self.player1  # Initialize with player1
-        # `opponent_player` is computed via property to avoid inconsistent state
+        self.players = (self.player1, self.player2)
+        self.cur = 0  # Index into `players` of the current player; starts with player1
+        # `current_player` / `opponent_player` are computed from `cur` to avoid inconsistent state
         # Start in the PLACING phase until players exhaust pieces_in_hand
         self.current_phase = GamePhase.PLACING
         self.selected_piece = None  # To track the piece selected for moving or flying
         self.game_history = []
         self.legal_moves = []
+        self._legal_cache = None  # memoized result of possible_legal_moves()
+        self.dirty = True  # state changed since the UI last drew it
         # Reset players' pieces
         self.player1.pieces_in_hand = 9
         self.player1.pieces_on_board = 0
         self.player2.pieces_in_hand = 9
         self.player2.pieces_on_board = 0
 
+    def _state_changed(self):
+        """Drop the cached legal moves and flag the state for redrawing."""
+        self._legal_cache = None
+        self.dirty = True
+
     def switch_player(self):
-        # Toggle only the authoritative `current_player` state. The
-        # `opponent_player` property computes the opponent on access.
-        self.current_player = self.player2 if self.current_player is self.player1 else self.player1
+        # Toggle only the authoritative `cur` index. The player
+        # properties look the players up on access.
+        self.cur ^= 1
+        self._state_changed()
+
+    @property
+    def current_player(self):
+        """Return the player whose turn it is."""
+        return self.players[self.cur]
 
     @property
     def opponent_player(self):
@@ -174,63 +256,87 @@ class Game():
 
         Computed on each access to avoid duplication of mutable state.
         """
-        return self.player2 if self.current_player is self.player1 else self.player1
+        return self.players[1 - self.cur]
+
+    def state_key(self):
+        """Return a hashable key identifying the current game state.
+
+        Positions reached by different move orders share the same key, so
+        it can index a transposition table or memoize AI evaluations.
+        Pieces on board are implied by the bitboards and not repeated.
+        """
+        return (
+            self.board_manager.bb_x,
+            self.board_manager.bb_o,
+            self.cur,
+            self.current_phase.value,
+            self.player1.pieces_in_hand,
+            self.player2.pieces_in_hand,
+            self.selected_piece,
+        )
     
-    def update_game_phase(self):
-        """Calculates and updates the phase for the CURRENT player."""
+    def update_game_phase(self, skip_win_check=False):
+        """Calculates and updates the phase for the CURRENT player.
+
+        By default the win condition is checked first. `finalize_turn`
+        passes `skip_win_check=True` because it has already settled the
+        win check for the turn that just ended.
+        """
+        self._state_changed()
         
         # 1. Check for Game Over
-        if self.check_win_condition():
+        if not skip_win_check and self.check_win_condition():
             self.current_phase = GamePhase.GAME_OVER
             return
             
-        # 2. Check for Placing
-        if self.current_player.pieces_in_hand > 0:
-            self.current_phase = GamePhase.PLACING
-        
-        # 3. Check for Flying
-        elif self.current_player.pieces_on_board == 3:
-            self.current_phase = GamePhase.FLYING
-        
-        # 4. Default to Moving
-        else:
-            self.current_phase = GamePhase.MOVING
-    
-    def get_allowed_moves(self, position_just_placed):
-        """
-        Returns a list of allowed move positions for the current player,
-        based on the current game phase and the given position.
-        """
-        if self.current_phase == GamePhase.PLACING:
-            return self.board_manager.get_empty_positions()
-        if self.current_phase == GamePhase.FLYING:
-            return self.board_manager.get_empty_positions()
-        if self.current_phase == GamePhase.MOVING:
-            return self.board_manager.get_empty_adjacent_positions(position_just_placed)
-        return []
+        # 2. Placing, flying or moving, from the player's piece counts
+        self.current_phase = self._phase_for(self.current_player)
+
+    @staticmethod
+    def _phase_for(player):
+        """Return the phase `player` is in on their turn, from their piece counts."""
+        # Placing while pieces remain in hand
+        if player.pieces_in_hand > 0:
+            return GamePhase.PLACING
+        # Flying with exactly 3 pieces left
+        if player.pieces_on_board == 3:
+            return GamePhase.FLYING
+        # Default to Moving
+        return GamePhase.MOVING
+
+    def _bitboards_for(self, player):
+        """Return `(bb_self, bb_opp)`: the bitboards of `player` and of their opponent."""
+        board_manager = self.board_manager
+        bb_self = board_manager.get_player_bitboard(player.player_symbol)
+        return bb_self, (board_manager.bb_x | board_manager.bb_o) & ~bb_self
     
-    mills_arrays = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8], [9, 10, 11],
-        [12, 13, 14], [15, 16, 17], [18, 19, 20], [21, 22, 23],
-        [0, 9, 21], [3, 10, 18], [6, 11, 15], [1, 4, 7],
-        [16, 19, 22], [8, 12, 17], [5, 13, 20], [2, 14, 23],
-        ]
+    mills_arrays = (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8), (9, 10, 11),
+        (12, 13, 14), (15, 16, 17), (18, 19, 20), (21, 22, 23),
+        (0, 9, 21), (3, 10, 18), (6, 11, 15), (1, 4, 7),
+        (16, 19, 22), (8, 12, 17), (5, 13, 20), (2, 14, 23),
+        )
     
+    # Bitmask of each mill, computed once at class load
+    MILL_MASKS = [sum(1 << p for p in mill) for mill in mills_arrays]
+
+    # For each position, the bitmasks of the (at most 2) mills that include it
+    MILLS_BY_POS = mills_by_position(MILL_MASKS)
+
     def is_position_part_of_mill(self, location):
         """Return True if the given location is part of a completed mill.
 
         A mill is three aligned pieces of the same symbol. Empty squares
         cannot be part of a mill.
         """
-        symbol_at_pos = self.board_manager.who_on_position(location)
-        if symbol_at_pos == ".":
+        symbol = self.board_manager.who_on_position(location)
+        if symbol == ".":
             return False
 
-        for mill in self.mills_arrays:
-            if location in mill:
-                # All positions in this mill must match the symbol at `location`.
-                if all(self.board_manager.board[pos] == symbol_at_pos for pos in mill):
-                    return True
+        bb = self.board_manager.bb_x if symbol == "X" else self.board_manager.bb_o
+        for mask in self.MILLS_BY_POS[location]:
+            if (bb & mask) == mask:
+                return True
         return False
 
     def get_allowed_removals(self):
@@ -239,14 +345,16 @@ class Game():
         an opponent's piece. If the opponent has pieces not in mills, only those
         can be removed.
         """
-        opponent_positions = self.board_manager.get_players_positions(self.opponent_player.player_symbol)
-        non_mill_positions = []
-        for pos in opponent_positions:
-            if not self.is_position_part_of_mill(pos):
-                non_mill_positions.append(pos)
-        if non_mill_positions:
-            return non_mill_positions
-        return opponent_positions
+        opponent_bb = self.board_manager.get_player_bitboard(self.opponent_player.player_symbol)
+        # Union of all the opponent's completed mills
+        in_mill = 0
+        for mask in self.MILL_MASKS:
+            if (opponent_bb & mask) == mask:
+                in_mill |= mask
+        candidates = opponent_bb & ~in_mill
+        if not candidates:
+            candidates = opponent_bb
+        return self.board_manager.bits_to_positions(candidates)
     
     def check_win_condition(self):
         """
@@ -259,26 +367,29 @@ class Game():
         # if self.current_phase == GamePhase.REMOVING_PIECE:
         #     return False
         
+        current = self.current_player
+        opponent = self.opponent_player
+
         # Check if opponent's pieces are less than 3 on board only after player and oppenent have placed all pieces
-        if self.current_player.pieces_in_hand == 0 and self.opponent_player.pieces_in_hand == 0:
-            if self.opponent_player.pieces_on_board < 3:
-                print(f"{self.current_player.name} ({self.current_player.player_symbol}) wins! Opponent has less than 3 pieces on board.")
+        if current.pieces_in_hand == 0 and opponent.pieces_in_hand == 0:
+            if opponent.pieces_on_board < 3:
+                print(f"{current.name} ({current.player_symbol}) wins! Opponent has less than 3 pieces on board.")
                 return True
             
         # Win if opponent does not have any valid moves
-        opponent_positions = self.board_manager.get_players_positions(self.opponent_player.player_symbol)
-        if opponent_positions == []:
+        opponent_bb, current_bb = self._bitboards_for(opponent)
+        if not opponent_bb:
+            return False
+        opponent_phase = self._phase_for(opponent)
+        if has_any_move(opponent_bb, current_bb, self.board_manager.ADJ_TABLE, opponent_phase.value):
             return False
-        for pos in opponent_positions:
-            if self.get_allowed_moves(pos):
-                return False
         
         #! Experimental
         # If any of the players still have pieces in hand, the game cannot be over
-        if self.current_player.pieces_in_hand >= 0 or self.opponent_player.pieces_in_hand >= 0:
+        if current.pieces_in_hand >= 0 or opponent.pieces_in_hand >= 0:
             return False
         
-        print(f"{self.current_player.name} ({self.current_player.player_symbol}) wins by blocking opponent's moves!")
+        print(f"{current.name} ({current.player_symbol}) wins by blocking opponent's moves!")
         return True
     
     def finalize_turn(self, position):
@@ -296,7 +407,10 @@ class Game():
             self.current_phase = GamePhase.REMOVING_PIECE
         else:
             self.switch_player()
-            self.update_game_phase()
+            # No second win check for the new current player: the player who
+            # just moved lost no pieces, and their mobility is only tested on
+            # their own next turn.
+            self.update_game_phase(skip_win_check=True)
     
     def handle_placing(self, position):
         """Handle an attempted placement on `position` by the current player.
@@ -307,6 +421,7 @@ class Game():
             self.current_player.place_piece()
 
             self.finalize_turn(position)
+            self._state_changed()
             return True
         return False
     
@@ -314,24 +429,30 @@ class Game():
         """
         Handles the moving phase: select a piece, deselect, or move to an adjacent empty position.
         """
+        symbol = self.current_player.player_symbol
+        board_manager = self.board_manager
+
         # Select a piece to move
         if self.selected_piece is None:
-            if self.board_manager.who_on_position(position) == self.current_player.player_symbol:
+            if board_manager.who_on_position(position) == symbol:
                 # Check if adjacent empty positions exist
-                if self.board_manager.get_empty_adjacent_positions(position):
+                if board_manager.has_empty_adjacent(position):
                     self.selected_piece = position
+                    self._state_changed()
                     return True
             return False
 
         # Deselect the selected piece
         if position == self.selected_piece:
             self.selected_piece = None
+            self._state_changed()
             return True
 
         # Attempt to move to an adjacent empty position
-        if (self.board_manager.move_player_piece(self.selected_piece, position, self.current_player.player_symbol)):
+        if board_manager.move_player_piece(self.selected_piece, position, symbol):
             self.finalize_turn(position)
             self.selected_piece = None
+            self._state_changed()
             return True
 
         return False
@@ -340,22 +461,28 @@ class Game():
         """
         Handles the flying phase: select a piece, deselect, or move to any empty position.
         """
+        symbol = self.current_player.player_symbol
+        board_manager = self.board_manager
+
         # Select a piece to fly
         if self.selected_piece is None:
-            if self.board_manager.who_on_position(position) == self.current_player.player_symbol:
+            if board_manager.who_on_position(position) == symbol:
                 self.selected_piece = position
+                self._state_changed()
                 return True
             return False
 
         # Deselect the selected piece
         if position == self.selected_piece:
             self.selected_piece = None
+            self._state_changed()
             return True
 
         # Attempt to fly to any empty position
-        if self.board_manager.fly_player_piece(self.selected_piece, position, self.current_player.player_symbol):
+        if board_manager.fly_player_piece(self.selected_piece, position, symbol):
             self.finalize_turn(position)
             self.selected_piece = None
+            self._state_changed()
             return True
 
         return False
@@ -377,11 +504,10 @@ class Game():
                 # self.switch_player()
                 # After a removal, update the phase for the now-current player
                 # self.update_game_phase()
-                # Check if win condition met after removal
-                self.check_win_condition()
-                
+                # The win condition after removal is checked by finalize_turn
                 self.finalize_turn(position)
                 
+                self._state_changed()
                 return True
         return False
     
@@ -414,8 +540,8 @@ class Game():
     def record_game_action(self, position):
         """Record the action taken by the current player at `position`.
         """
-        # store a shallow copy of the board list to avoid later mutations
-        self.game_history.append([self.board_manager.board.copy(), self.current_player, self.current_phase, position])
+        # the bitboards are plain ints, so the snapshot needs no copying
+        self.game_history.append((self.board_manager.bb_x, self.board_manager.bb_o, self.cur, self.current_phase, position, self.selected_piece))
         print(f"Recorded action at position {position}. History length: {len(self.game_history)}")
         
     def undo_action(self):
@@ -425,47 +551,72 @@ class Game():
         """
         if not self.game_history:
             return False
-        last_state = self.game_history.pop()
-        # restore copies to avoid keeping references to old mutable lists
-        self.board_manager.board = last_state[0].copy()
-        self.current_player = last_state[1]
-        self.current_phase = last_state[2]
+        bb_x, bb_o, cur, phase, _position, selected_piece = self.game_history.pop()
+        self.board_manager.bb_x, self.board_manager.bb_o = bb_x, bb_o
+        self.cur = cur
+        self.current_phase = phase
+        self.selected_piece = selected_piece
+        self._state_changed()
         return True
 
+    def _legal_moves_bb(self, phase, selected_piece=-1):
+        """Return the bitmask of legal choices for the current player in `phase`.
+
+        Without a selection (`selected_piece` < 0) these are the positions
+        to place on (PLACING) or the pieces that can be picked up (MOVING,
+        FLYING); with a selection, the positions the piece can go to.
+        Other phases have no moves and yield 0.
+        """
+        bb_self, bb_opp = self._bitboards_for(self.current_player)
+
+        if phase == GamePhase.PLACING:
+            return legal_moves_place(bb_self, bb_opp)
+        if phase == GamePhase.MOVING:
+            # Pieces with an empty neighbour, or the selected piece's empty neighbours
+            return legal_moves_move(bb_self, bb_opp, self.board_manager.ADJ_TABLE, selected_piece)
+        if phase == GamePhase.FLYING:
+            # Any own piece, or any empty position once a piece is selected
+            return legal_moves_fly(bb_self, bb_opp, selected_piece)
+        return 0
+
     def possible_legal_moves(self):
         """Get all possible moves for the current player based on the game phase.
 
         Returns a list of valid positions the current player can move to.
+        The result is cached until the next state-changing action, so
+        callers must not mutate it.
         """
-        possible_moves = []
-        if self.current_phase == GamePhase.PLACING:
-            possible_moves = self.board_manager.get_empty_positions()
-            
-        elif self.current_phase == GamePhase.MOVING:
-            player_positions = self.board_manager.get_players_positions(self.current_player.player_symbol)
-            if self.selected_piece is None:
-                # List all pieces that have at least one adjacent empty position
-                for pos in player_positions:
-                    if len(self.board_manager.get_empty_adjacent_positions(pos)) > 0:
-                        possible_moves.append(pos)
-            else:
-                # List all empty adjacent positions for the selected piece
-                possible_moves = self.board_manager.get_empty_adjacent_positions(self.selected_piece)
-                
-        elif self.current_phase == GamePhase.FLYING:
-            if self.selected_piece is None:
-                player_positions = self.board_manager.get_players_positions(self.current_player.player_symbol)
-                if self.selected_piece is None:
-                    # List all pieces that can fly
-                    for pos in player_positions:
-                        possible_moves.append(pos)
-            else:
-                # List all empty positions for flying
-                possible_moves = self.board_manager.get_empty_positions()
-                
-        elif self.current_phase == GamePhase.REMOVING_PIECE:
+        if self._legal_cache is not None:
+            return self._legal_cache
+
+        phase = self.current_phase
+        if phase == GamePhase.REMOVING_PIECE:
             possible_moves = self.get_allowed_removals()
-        return list(set(possible_moves))  # Remove duplicates
+        else:
+            selected_piece = -1 if self.selected_piece is None else self.selected_piece
+            possible_moves = self.board_manager.bits_to_positions(
+                self._legal_moves_bb(phase, selected_piece))
+        # Every branch above already yields unique positions
+        self._legal_cache = possible_moves
+        return possible_moves
+
+# Text layout of the board; `{i}` is replaced by the display character of position i
+BOARD_TEMPLATE = ''' 
+            {0} --------------------- {1} --------------------- {2} 
+            |                       |                       |
+            |       {3} ------------- {4} ------------- {5}       |
+            |       |               |               |       |
+            |       |        {6} ---- {7} ---- {8}        |       |
+            |       |        |             |        |       |
+            {9} ----- {10} ------ {11}             {12} ------ {13} ----- {14}
+            |       |        |             |        |       |
+            |       |        {15} ---- {16} ---- {17}        |       |
+            |       |               |               |       |
+            |       {18} ------------- {19} ------------- {20}       |
+            |                       |                       |
+            {21} --------------------- {22} --------------------- {23} 
+            '''
+
 
 class NineMensMorrisUI():
     # ANSI Color Constants
@@ -476,6 +627,11 @@ class NineMensMorrisUI():
     RESET = "\033[0m"
     CLEAR = "\033[H\033[J" # Cursor to top + Clear screen
 
+    # Precomputed display strings for each board character and marker
+    PIECE_CHARS = {"X": f"{RED}X{RESET}", "O": f"{BLUE}O{RESET}", ".": "."}
+    SELECTED_CHAR = f"{GREEN}#{RESET}"
+    HINT_CHAR = f"{YELLOW}?{RESET}"
+
     def __init__(self, game_type="ai_vs_ai", ai_model=SimpleAI):
         self.game_type = game_type.lower()
         self.ai_model = ai_model
@@ -498,43 +654,24 @@ class NineMensMorrisUI():
 
     def draw_colored_board(self):
         """Processes board state with colors and hints before drawing."""
-        raw_board = self.game.board_manager.board
+        raw_board = self.game.board_manager.to_list()
         legal_moves = self.game.possible_legal_moves()
+        selected_piece = self.game.selected_piece
+        piece_chars = self.PIECE_CHARS
         display_chars = []
 
         for i, char in enumerate(raw_board):
             # 1. Highlight Selected Piece
-            if i == self.game.selected_piece:
-                display_chars.append(f"{self.GREEN}#{self.RESET}")
-            # 2. Color Player Pieces
-            elif char == "X":
-                display_chars.append(f"{self.RED}X{self.RESET}")
-            elif char == "O":
-                display_chars.append(f"{self.BLUE}O{self.RESET}")
-            # 3. Show Hints for Legal Moves (dots become ?)
-            elif i in legal_moves:
-                display_chars.append(f"{self.YELLOW}?{self.RESET}")
-            # 4. Standard Empty Spot
+            if i == selected_piece:
+                display_chars.append(self.SELECTED_CHAR)
+            # 2. Show Hints for Legal Moves (dots become ?)
+            elif char == "." and i in legal_moves:
+                display_chars.append(self.HINT_CHAR)
+            # 3. Color Player Pieces / Standard Empty Spot
             else:
-                display_chars.append(".")
+                display_chars.append(piece_chars[char])
 
-        # The actual board template using display_chars
-        drawn_board = f''' 
-            {display_chars[0]} --------------------- {display_chars[1]} --------------------- {display_chars[2]} 
-            |                       |                       |
-            |       {display_chars[3]} ------------- {display_chars[4]} ------------- {display_chars[5]}       |
-            |       |               |               |       |
-            |       |        {display_chars[6]} ---- {display_chars[7]} ---- {display_chars[8]}        |       |
-            |       |        |             |        |       |
-            {display_chars[9]} ----- {display_chars[10]} ------ {display_chars[11]}             {display_chars[12]} ------ {display_chars[13]} ----- {display_chars[14]}
-            |       |        |             |        |       |
-            |       |        {display_chars[15]} ---- {display_chars[16]} ---- {display_chars[17]}        |       |
-            |       |               |               |       |
-            |       {display_chars[18]} ------------- {display_chars[19]} ------------- {display_chars[20]}       |
-            |                       |                       |
-            {display_chars[21]} --------------------- {display_chars[22]} --------------------- {display_chars[23]} 
-            '''
-        print(drawn_board)
+        print(BOARD_TEMPLATE.format(*display_chars))
 
     def print_game_status(self):
         p = self.game.current_player
@@ -564,12 +701,15 @@ class NineMensMorrisUI():
 
     def run_game_loop(self):
         while True:
-            # Clear terminal for a "Game App" feel
-            print(self.CLEAR, end="") 
-            
-            self.draw_colored_board()
-            self.print_game_status()
-            self.print_user_prompt()
+            # Redraw only when the state changed; a rejected input keeps the current frame
+            if self.game.dirty:
+                # Clear terminal for a "Game App" feel
+                print(self.CLEAR, end="") 
+                
+                self.draw_colored_board()
+                self.print_game_status()
+                self.print_user_prompt()
+                self.game.dirty = False
 
             try:
                 # Add legal move hint to the input line